@@ -28,7 +28,11 @@ type kvStore interface {
 	Close() error
 	Set(key, value []byte) error
 	Get(key []byte) ([]byte, error)
+	GetMany(keys [][]byte) ([][]byte, error)
 	Delete(key []byte) error
+	Increment(key []byte, delta int64) (int64, error)
+	// Iterate calls fn for each entry under prefix. k and v are only valid
+	// for the duration of the call; fn must copy anything it keeps.
 	Iterate(prefix []byte, fn func(k, v []byte) error) error
 	Sync() error
 	Apply(ops []operation) error
@@ -40,6 +44,16 @@ type operation struct {
 	value []byte
 }
 
+// Operation codes 0 (set) and 1 (delete) write; the expect codes are guards
+// evaluated in the same batch, failing it with errConflict when the stored
+// value differs from op.value (opExpect) or the key exists (opExpectMissing).
+const (
+	opExpect        = 2
+	opExpectMissing = 3
+)
+
+var errConflict = errors.New("conditional write conflict")
+
 var (
 	handleMu  sync.RWMutex
 	handles           = make(map[uintptr]kvStore)
@@ -48,15 +62,18 @@ var (
 	lastError string
 )
 
+// setError records err for LastError and maps it to a status code. Success
+// leaves the previous message in place: with several threads calling into
+// the library, clearing it would race with a failing caller that has not read
+// its message yet, and skipping the lock keeps successful calls contention-free.
 func setError(err error) C.int {
+	if err == nil {
+		return 0
+	}
 	errorMu.Lock()
 	defer errorMu.Unlock()
-	if err != nil {
-		lastError = err.Error()
-		return -1
-	}
-	lastError = ""
-	return 0
+	lastError = err.Error()
+	return -1
 }
 
 func storeHandle(store kvStore) uintptr {
@@ -78,6 +95,16 @@ func getHandle(id uintptr) (kvStore, error) {
 	return store, nil
 }
 
+func isNotFound(err error) bool {
+	if err == nil {
+		return false
+	}
+	if errors.Is(err, badger.ErrKeyNotFound) {
+		return true
+	}
+	return strings.Contains(strings.ToLower(err.Error()), "not found")
+}
+
 func deleteHandle(id uintptr) {
 	handleMu.Lock()
 	defer handleMu.Unlock()
@@ -123,12 +150,65 @@ func (s *badgerStore) Get(key []byte) ([]byte, error) {
 	return result, err
 }
 
+func (s *badgerStore) GetMany(keys [][]byte) ([][]byte, error) {
+	results := make([][]byte, len(keys))
+	err := s.db.View(func(txn *badger.Txn) error {
+		for i, key := range keys {
+			item, err := txn.Get(key)
+			if errors.Is(err, badger.ErrKeyNotFound) {
+				continue
+			}
+			if err != nil {
+				return err
+			}
+			val, err := item.ValueCopy(nil)
+			if err != nil {
+				return err
+			}
+			if val == nil {
+				val = []byte{}
+			}
+			results[i] = val
+		}
+		return nil
+	})
+	return results, err
+}
+
 func (s *badgerStore) Delete(key []byte) error {
 	return s.db.Update(func(txn *badger.Txn) error {
 		return txn.Delete(key)
 	})
 }
 
+func (s *badgerStore) Increment(key []byte, delta int64) (int64, error) {
+	for {
+		var next int64
+		err := s.db.Update(func(txn *badger.Txn) error {
+			var current []byte
+			item, err := txn.Get(key)
+			switch {
+			case errors.Is(err, badger.ErrKeyNotFound):
+			case err != nil:
+				return err
+			default:
+				if current, err = item.ValueCopy(nil); err != nil {
+					return err
+				}
+			}
+			next, err = addToIntValue(current, delta)
+			if err != nil {
+				return err
+			}
+			return txn.Set(key, encodeIntValue(next))
+		})
+		if errors.Is(err, badger.ErrConflict) {
+			continue
+		}
+		return next, err
+	}
+}
+
 func (s *badgerStore) Iterate(prefix []byte, fn func(k, v []byte) error) error {
 	return s.db.View(func(txn *badger.Txn) error {
 		opts := badger.DefaultIteratorOptions
@@ -137,9 +217,9 @@ func (s *badgerStore) Iterate(prefix []byte, fn func(k, v []byte) error) error {
 		defer it.Close()
 
 		doIter := func(item *badger.Item) error {
-			key := item.KeyCopy(nil)
+			key := item.Key()
 			return item.Value(func(val []byte) error {
-				return fn(key, append([]byte(nil), val...))
+				return fn(key, val)
 			})
 		}
 
@@ -167,6 +247,30 @@ func (s *badgerStore) Apply(ops []operation) error {
 	return s.db.Update(func(txn *badger.Txn) error {
 		for _, op := range ops {
 			switch op.op {
+			case opExpect, opExpectMissing:
+				item, err := txn.Get(op.key)
+				if errors.Is(err, badger.ErrKeyNotFound) {
+					if op.op == opExpect {
+						return errConflict
+					}
+					continue
+				}
+				if err != nil {
+					return err
+				}
+				if op.op == opExpectMissing {
+					return errConflict
+				}
+				matches := false
+				if err := item.Value(func(val []byte) error {
+					matches = bytes.Equal(val, op.value)
+					return nil
+				}); err != nil {
+					return err
+				}
+				if !matches {
+					return errConflict
+				}
 			case 0:
 				if err := txn.Set(op.key, op.value); err != nil {
 					return err
@@ -187,8 +291,30 @@ func (s *badgerStore) Apply(ops []operation) error {
 }
 
 type slateStore struct {
-	db *slatedb.DB
+	db        *slatedb.DB
 	writeOpts *slatedb.WriteOptions
+	// rmwMu serialises read-modify-write helpers; SlateDB has no transactions.
+	// It is shared by every handle opened on the same path in this process.
+	rmwMu *sync.Mutex
+}
+
+var (
+	slateRMWGuard sync.Mutex
+	slateRMWLocks = make(map[string]*sync.Mutex)
+)
+
+func slateRMWLock(path string) *sync.Mutex {
+	if abs, err := filepath.Abs(path); err == nil {
+		path = abs
+	}
+	slateRMWGuard.Lock()
+	defer slateRMWGuard.Unlock()
+	mu, ok := slateRMWLocks[path]
+	if !ok {
+		mu = &sync.Mutex{}
+		slateRMWLocks[path] = mu
+	}
+	return mu
 }
 
 func (s *slateStore) Close() error { return s.db.Close() }
@@ -205,10 +331,46 @@ func (s *slateStore) Get(key []byte) ([]byte, error) {
 	return value, nil
 }
 
+func (s *slateStore) GetMany(keys [][]byte) ([][]byte, error) {
+	results := make([][]byte, len(keys))
+	for i, key := range keys {
+		value, err := s.db.Get(key)
+		if isNotFound(err) {
+			continue
+		}
+		if err != nil {
+			return nil, err
+		}
+		if value == nil {
+			value = []byte{}
+		}
+		results[i] = value
+	}
+	return results, nil
+}
+
 func (s *slateStore) Delete(key []byte) error {
 	return s.db.DeleteWithOptions(key, s.writeOpts)
 }
 
+func (s *slateStore) Increment(key []byte, delta int64) (int64, error) {
+	s.rmwMu.Lock()
+	defer s.rmwMu.Unlock()
+
+	current, err := s.db.Get(key)
+	if isNotFound(err) {
+		current, err = nil, nil
+	}
+	if err != nil {
+		return 0, err
+	}
+	next, err := addToIntValue(current, delta)
+	if err != nil {
+		return 0, err
+	}
+	return next, s.db.PutWithOptions(key, encodeIntValue(next), nil, s.writeOpts)
+}
+
 func (s *slateStore) Iterate(prefix []byte, fn func(k, v []byte) error) error {
 	start, end := prefixRange(prefix)
 	iter, err := s.db.Scan(start, end)
@@ -228,7 +390,7 @@ func (s *slateStore) Iterate(prefix []byte, fn func(k, v []byte) error) error {
 		if len(prefix) > 0 && !bytes.HasPrefix(kv.Key, prefix) {
 			continue
 		}
-		if err := fn(append([]byte(nil), kv.Key...), append([]byte(nil), kv.Value...)); err != nil {
+		if err := fn(kv.Key, kv.Value); err != nil {
 			return err
 		}
 	}
@@ -237,6 +399,9 @@ func (s *slateStore) Iterate(prefix []byte, fn func(k, v []byte) error) error {
 func (s *slateStore) Sync() error { return s.db.Flush() }
 
 func (s *slateStore) Apply(ops []operation) error {
+	s.rmwMu.Lock()
+	defer s.rmwMu.Unlock()
+
 	batch, err := slatedb.NewWriteBatch()
 	if err != nil {
 		return err
@@ -245,6 +410,20 @@ func (s *slateStore) Apply(ops []operation) error {
 
 	for _, op := range ops {
 		switch op.op {
+		case opExpect, opExpectMissing:
+			current, err := s.db.Get(op.key)
+			if isNotFound(err) {
+				if op.op == opExpect {
+					return errConflict
+				}
+				continue
+			}
+			if err != nil {
+				return err
+			}
+			if op.op == opExpectMissing || !bytes.Equal(current, op.value) {
+				return errConflict
+			}
 		case 0:
 			if err := batch.Put(op.key, op.value); err != nil {
 				return err
@@ -261,6 +440,57 @@ func (s *slateStore) Apply(ops []operation) error {
 	return s.db.Write(batch)
 }
 
+// valueTagInt matches the Python wrapper's _VALUE_INT tag: the payload is a
+// little-endian two's complement integer of 1 to 8 bytes.
+const valueTagInt = 0x03
+
+var errNotInteger = errors.New("value is not a 64-bit integer")
+
+func decodeIntValue(data []byte) (int64, error) {
+	if len(data) < 2 || len(data) > 9 || data[0] != valueTagInt {
+		return 0, errNotInteger
+	}
+	payload := data[1:]
+	var v uint64
+	for i := len(payload) - 1; i >= 0; i-- {
+		v = v<<8 | uint64(payload[i])
+	}
+	shift := uint(64 - 8*len(payload))
+	return int64(v<<shift) >> shift, nil
+}
+
+func encodeIntValue(v int64) []byte {
+	var tmp [8]byte
+	binary.LittleEndian.PutUint64(tmp[:], uint64(v))
+	n := len(tmp)
+	for n > 1 {
+		top, sign := tmp[n-1], tmp[n-2]&0x80
+		if (top == 0x00 && sign == 0) || (top == 0xff && sign != 0) {
+			n--
+			continue
+		}
+		break
+	}
+	return append([]byte{valueTagInt}, tmp[:n]...)
+}
+
+// addToIntValue adds delta to an encoded integer value; a nil value counts as zero.
+func addToIntValue(current []byte, delta int64) (int64, error) {
+	var value int64
+	if current != nil {
+		decoded, err := decodeIntValue(current)
+		if err != nil {
+			return 0, err
+		}
+		value = decoded
+	}
+	next := value + delta
+	if (delta > 0 && next < value) || (delta < 0 && next > value) {
+		return 0, errors.New("integer overflow")
+	}
+	return next, nil
+}
+
 type slateOpenConfig struct {
 	Path  string               `json:"path"`
 	Store *slatedb.StoreConfig `json:"store,omitempty"`
@@ -338,8 +568,9 @@ func openSlate(raw string) (kvStore, error) {
 		db: db,
 		writeOpts: &slatedb.WriteOptions{
 			AwaitDurable: cfg.Async,
-			},
-		}, nil
+		},
+		rmwMu: slateRMWLock(cfg.Path),
+	}, nil
 }
 
 func defaultDataDir(name string) string {
@@ -374,6 +605,26 @@ func Set(handle C.uintptr_t, key *C.char, keyLen C.int, value *C.char, valueLen
 	return setError(err)
 }
 
+// SetTagged stores tag followed by value, building the tagged record in the
+// single Go-side copy so callers never concatenate tag and payload themselves.
+//
+//export SetTagged
+func SetTagged(handle C.uintptr_t, key *C.char, keyLen C.int, tag C.uchar, value *C.char, valueLen C.int) C.int {
+	store, err := getHandle(uintptr(handle))
+	if err != nil {
+		return setError(err)
+	}
+	gotKey := C.GoBytes(unsafe.Pointer(key), keyLen)
+	size := int(valueLen)
+	gotValue := make([]byte, size+1)
+	gotValue[0] = byte(tag)
+	if size > 0 {
+		copy(gotValue[1:], unsafe.Slice((*byte)(unsafe.Pointer(value)), size))
+	}
+	err = store.Set(gotKey, gotValue)
+	return setError(err)
+}
+
 //export Get
 func Get(handle C.uintptr_t, key *C.char, keyLen C.int, valueLen *C.int) *C.char {
 	store, err := getHandle(uintptr(handle))
@@ -413,6 +664,95 @@ func Get(handle C.uintptr_t, key *C.char, keyLen C.int, valueLen *C.int) *C.char
 	return (*C.char)(buf)
 }
 
+// GetInto copies the value for key into the caller-provided buffer out.
+// It returns 0 on success, 1 when outCap is too small (valueLen then holds the
+// required size and nothing is copied), 2 when the key does not exist, and -1
+// on error.
+//
+//export GetInto
+func GetInto(handle C.uintptr_t, key *C.char, keyLen C.int, out *C.char, outCap C.int, valueLen *C.int) C.int {
+	store, err := getHandle(uintptr(handle))
+	if err != nil {
+		return setError(err)
+	}
+	gotKey := C.GoBytes(unsafe.Pointer(key), keyLen)
+
+	data, err := store.Get(gotKey)
+	if isNotFound(err) {
+		setError(nil)
+		return 2
+	}
+	if err != nil {
+		return setError(err)
+	}
+
+	size := len(data)
+	*valueLen = C.int(size)
+	if size > int(outCap) {
+		setError(nil)
+		return 1
+	}
+	if size > 0 {
+		copy(((*[1 << 30]byte)(unsafe.Pointer(out)))[:size:size], data)
+	}
+	return setError(nil)
+}
+
+// missingValueLen marks absent keys in the GetMany result buffer.
+const missingValueLen = 0xFFFFFFFF
+
+//export GetMany
+func GetMany(handle C.uintptr_t, keys *C.char, keysLen C.int, resultLen *C.int) *C.char {
+	store, err := getHandle(uintptr(handle))
+	if err != nil {
+		setError(err)
+		return nil
+	}
+
+	data := C.GoBytes(unsafe.Pointer(keys), keysLen)
+	decoded, err := decodeKeys(data)
+	if err != nil {
+		setError(err)
+		return nil
+	}
+
+	values, err := store.GetMany(decoded)
+	if err != nil {
+		setError(err)
+		return nil
+	}
+
+	var buffer []byte
+	var tmp [4]byte
+	for _, value := range values {
+		if value == nil {
+			binary.LittleEndian.PutUint32(tmp[:], missingValueLen)
+			buffer = append(buffer, tmp[:]...)
+			continue
+		}
+		binary.LittleEndian.PutUint32(tmp[:], uint32(len(value)))
+		buffer = append(buffer, tmp[:]...)
+		buffer = append(buffer, value...)
+	}
+
+	if len(buffer) == 0 {
+		*resultLen = 0
+		setError(nil)
+		return nil
+	}
+
+	mem := C.malloc(C.size_t(len(buffer)))
+	if mem == nil {
+		setError(errors.New("malloc failed"))
+		return nil
+	}
+
+	copy(((*[1 << 30]byte)(unsafe.Pointer(mem)))[:len(buffer):len(buffer)], buffer)
+	*resultLen = C.int(len(buffer))
+	setError(nil)
+	return (*C.char)(mem)
+}
+
 //export Delete
 func Delete(handle C.uintptr_t, key *C.char, keyLen C.int) C.int {
 	store, err := getHandle(uintptr(handle))
@@ -424,6 +764,21 @@ func Delete(handle C.uintptr_t, key *C.char, keyLen C.int) C.int {
 	return setError(err)
 }
 
+//export Incr
+func Incr(handle C.uintptr_t, key *C.char, keyLen C.int, delta C.longlong, result *C.longlong) C.int {
+	store, err := getHandle(uintptr(handle))
+	if err != nil {
+		return setError(err)
+	}
+	gotKey := C.GoBytes(unsafe.Pointer(key), keyLen)
+	next, err := store.Increment(gotKey, int64(delta))
+	if err != nil {
+		return setError(err)
+	}
+	*result = C.longlong(next)
+	return setError(nil)
+}
+
 //export Sync
 func Sync(handle C.uintptr_t) C.int {
 	store, err := getHandle(uintptr(handle))
@@ -433,8 +788,12 @@ func Sync(handle C.uintptr_t) C.int {
 	return setError(store.Sync())
 }
 
+// Scan returns nil with resultLen 0 when nothing matches and nil with
+// resultLen -1 on error.
+//
 //export Scan
 func Scan(handle C.uintptr_t, prefix *C.char, prefixLen C.int, resultLen *C.int) *C.char {
+	*resultLen = -1
 	store, err := getHandle(uintptr(handle))
 	if err != nil {
 		setError(err)
@@ -504,7 +863,7 @@ func decodeOperations(data []byte) ([]operation, error) {
 		offset += int(keyLen)
 
 		switch op {
-		case 0:
+		case 0, opExpect:
 			if offset+4 > len(data) {
 				return nil, errors.New("malformed operation value length")
 			}
@@ -516,7 +875,7 @@ func decodeOperations(data []byte) ([]operation, error) {
 			value := append([]byte(nil), data[offset:offset+int(valLen)]...)
 			offset += int(valLen)
 			ops = append(ops, operation{op: op, key: key, value: value})
-		case 1:
+		case 1, opExpectMissing:
 			ops = append(ops, operation{op: op, key: key})
 		default:
 			return nil, errors.New("unknown operation code")
@@ -525,6 +884,24 @@ func decodeOperations(data []byte) ([]operation, error) {
 	return ops, nil
 }
 
+func decodeKeys(data []byte) ([][]byte, error) {
+	var keys [][]byte
+	offset := 0
+	for offset < len(data) {
+		if offset+4 > len(data) {
+			return nil, errors.New("malformed key length")
+		}
+		keyLen := binary.LittleEndian.Uint32(data[offset : offset+4])
+		offset += 4
+		if offset+int(keyLen) > len(data) {
+			return nil, errors.New("malformed key")
+		}
+		keys = append(keys, data[offset:offset+int(keyLen)])
+		offset += int(keyLen)
+	}
+	return keys, nil
+}
+
 func prefixRange(prefix []byte) ([]byte, []byte) {
 	if len(prefix) == 0 {
 		return nil, nil
@@ -546,7 +923,7 @@ func nextPrefix(prefix []byte) []byte {
 }
 
 //export Apply
-func Apply(handle C.uintptr_t, ops *C.char, opsLen C.int) C.int {
+func Apply(handle C.uintptr_t, ops *C.char, opsLen C.int, syncAfter C.int) C.int {
 	store, err := getHandle(uintptr(handle))
 	if err != nil {
 		return setError(err)
@@ -558,7 +935,15 @@ func Apply(handle C.uintptr_t, ops *C.char, opsLen C.int) C.int {
 		return setError(err)
 	}
 
-	return setError(store.Apply(decoded))
+	err = store.Apply(decoded)
+	if errors.Is(err, errConflict) || errors.Is(err, badger.ErrConflict) {
+		setError(err)
+		return 1
+	}
+	if err == nil && syncAfter != 0 {
+		err = store.Sync()
+	}
+	return setError(err)
 }
 
 //export LastError
@@ -2,12 +2,15 @@ import atexit
 import ctypes
 import importlib
 import dataclasses
+import functools
 import json
 import os
 import pickle
 import struct
+import sys
 import tempfile
 import threading
+import zlib
 from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
@@ -25,9 +28,31 @@ except ImportError:  # pragma: no cover
 
 BytesLike = Union[bytes, bytearray, memoryview, str]
 _MISSING = object()
+# Pinned rather than pickle.HIGHEST_PROTOCOL: pickled keys must stay
+# byte-identical across interpreter upgrades or lookups would miss.
+_PICKLE_PROTOCOL = 5
 _VALUE_RAW = 0x00
 _VALUE_STR = 0x01
 _VALUE_PICKLED = 0x02
+_VALUE_INT = 0x03
+_VALUE_FLOAT = 0x04
+_FLOAT_STRUCT = struct.Struct("<d")
+# Range of the C long long that incr() hands to the Go library.
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+# PersistentObject keys are laid out as ``namespace + marker + key`` where the
+# marker says how the key was encoded; other key types are pickled after it.
+_NSKEY_SEPARATOR = b"\x1f"
+_NSKEY_STR = b"\x1fs"
+_NSKEY_BYTES = b"\x1fb"
+_NSKEY_PICKLED = b"\x1fp"
+# Older releases stored ``pickle.dumps((namespace, key))``: a protocol 4/5
+# pickle whose frame header (PROTO, FRAME + 8-byte length) is this long.
+_LEGACY_KEY_HEADER_LEN = 11
+# Per-entry header of Scan results: key length, value length.
+_SCAN_HEADER = struct.Struct("<II")
+# Sentinel length the Go side uses for absent keys in GetMany results.
+_MISSING_VALUE_LEN = 0xFFFFFFFF
 
 try:  # Optional dependency
     from pydantic import BaseModel as _PydanticBaseModel  # type: ignore
@@ -37,39 +62,187 @@ except ImportError:  # pragma: no cover - pydantic optional
     _PydanticPrivateAttr = None  # type: ignore
 
 
+# Number of distinct byte ranges keyed locks hash onto in the lock file.
+_LOCK_SLOTS = 4096
+
+_DEFAULT_LIB_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "libskyshelve" + {"win32": ".dll", "darwin": ".dylib"}.get(sys.platform, ".so"),
+)
+
+_READ_BUFFER_SIZE = 4096
+# Per-thread read buffers grow up to this size and are kept for reuse; larger
+# values are read into a one-off buffer instead.
+_READ_BUFFER_RETAIN = 128 * 1024
+
+
+class _ReadBuffer(threading.local):
+    """Thread-local scratch buffer that ``SkyShelve.get`` reads values into."""
+
+    def __init__(self) -> None:
+        self.length = ctypes.c_int()
+        self.length_ref = ctypes.byref(self.length)
+        self.resize(_READ_BUFFER_SIZE)
+
+    def resize(self, capacity: int) -> None:
+        data = bytearray(capacity)
+        self.view = memoryview(data)
+        self.target = (ctypes.c_char * capacity).from_buffer(data)
+        self.capacity = capacity
+
+
+_read_buffer = _ReadBuffer()
+
+
+def _int_payload(value: int) -> bytes:
+    # Minimal little-endian two's complement, byte-for-byte what Go's
+    # encodeIntValue produces; incr() accepts payloads of up to 8 bytes.
+    return value.to_bytes((value + (value < 0)).bit_length() // 8 + 1, "little", signed=True)
+
+
+# Encoders keyed by exact type; a dict lookup on type(x) is cheaper than an
+# isinstance cascade. Subclasses miss the table and take the isinstance path.
+def _tag_raw(value: Union[bytes, bytearray, memoryview]) -> Tuple[int, bytes]:
+    return _VALUE_RAW, bytes(value)
+
+
+def _tag_str(value: str) -> Tuple[int, bytes]:
+    return _VALUE_STR, value.encode("utf-8")
+
+
+def _tag_int(value: int) -> Tuple[int, bytes]:
+    return _VALUE_INT, _int_payload(value)
+
+
+def _tag_float(value: float) -> Tuple[int, bytes]:
+    return _VALUE_FLOAT, _FLOAT_STRUCT.pack(value)
+
+
+_KEY_ENCODERS: Dict[type, Callable[[Any], bytes]] = {
+    str: str.encode,
+    bytes: bytes,
+    bytearray: bytes,
+    memoryview: bytes,
+}
+_VALUE_ENCODERS: Dict[type, Callable[[Any], Tuple[int, bytes]]] = {
+    bytes: _tag_raw,
+    bytearray: _tag_raw,
+    memoryview: _tag_raw,
+    str: _tag_str,
+    int: _tag_int,
+    float: _tag_float,
+}
+
+
 class _FileLock:
-    """Minimal cross-platform advisory file lock for inter-process coordination."""
+    """Minimal cross-platform advisory file lock for inter-process coordination.
+
+    When ``key`` is given on POSIX, only a one-byte range of the lock file
+    derived from the key is locked, so operations on different keys proceed in
+    parallel. Without a key (or on Windows) the whole file is locked.
+    """
+
+    # POSIX record locks belong to the process and closing *any* descriptor of
+    # the file drops them all, so keyed locks share one descriptor per path
+    # that stays open until discard(). Record locks do not exclude threads of
+    # the same process, hence the per-slot threading locks.
+    _range_guard = threading.Lock()
+    _range_fds: Dict[Path, int] = {}
+    _range_users: Dict[Path, int] = {}
+    _slot_locks: Dict[Tuple[Path, int], threading.Lock] = {}
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, key: Optional[bytes] = None) -> None:
         self._path = path
-        self._fh: Optional[Any] = None
+        self._key = key
+        self._fd: Optional[int] = None
+        self._range: Optional[Tuple[int, int, threading.Lock]] = None
 
     def acquire(self) -> None:
+        if self._key is not None and fcntl is not None:
+            self._acquire_range(self._key)
+            return
         self._path.parent.mkdir(parents=True, exist_ok=True)
         fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
-        self._fh = os.fdopen(fd, "r+b", buffering=0)
-        if fcntl is not None:
-            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
-        elif msvcrt is not None:  # pragma: no cover - Windows only
-            # Ensure there is at least one byte to lock on Windows.
-            if self._fh.tell() == 0:
-                self._fh.write(b"\0")
-                self._fh.flush()
-            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
-        else:  # pragma: no cover - platforms without locking support
-            raise RuntimeError("file locking is not supported on this platform")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            elif msvcrt is not None:  # pragma: no cover - Windows only
+                # Ensure there is at least one byte to lock on Windows.
+                if os.fstat(fd).st_size == 0:
+                    os.write(fd, b"\0")
+                    os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            else:  # pragma: no cover - platforms without locking support
+                raise RuntimeError("file locking is not supported on this platform")
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def _acquire_range(self, key: bytes) -> None:
+        assert fcntl is not None
+        # crc32 rather than hash(): the offset must agree across processes.
+        slot = zlib.crc32(key) % _LOCK_SLOTS
+        with _FileLock._range_guard:
+            fd = _FileLock._range_fds.get(self._path)
+            if fd is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+                _FileLock._range_fds[self._path] = fd
+            _FileLock._range_users[self._path] = _FileLock._range_users.get(self._path, 0) + 1
+            thread_lock = _FileLock._slot_locks.setdefault((self._path, slot), threading.Lock())
+        thread_lock.acquire()
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX, 1, slot)
+        except BaseException:
+            thread_lock.release()
+            self._release_user()
+            raise
+        self._range = (fd, slot, thread_lock)
+
+    def _release_user(self) -> None:
+        with _FileLock._range_guard:
+            _FileLock._range_users[self._path] -= 1
+
+    @classmethod
+    def discard(cls, path: Path) -> None:
+        """Close the shared descriptor kept for keyed locks on ``path``.
+
+        Does nothing while a keyed lock on ``path`` is held or being acquired,
+        since closing the descriptor would drop the process's record locks.
+        """
+
+        with cls._range_guard:
+            if cls._range_users.get(path):
+                return
+            cls._range_users.pop(path, None)
+            fd = cls._range_fds.pop(path, None)
+            for slot_key in [k for k in cls._slot_locks if k[0] == path]:
+                del cls._slot_locks[slot_key]
+            if fd is not None:
+                os.close(fd)
 
     def release(self) -> None:
-        if not self._fh:
+        if self._range is not None:
+            fd, slot, thread_lock = self._range
+            self._range = None
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, slot)  # type: ignore[union-attr]
+            finally:
+                thread_lock.release()
+                self._release_user()
+            return
+        fd = self._fd
+        if fd is None:
             return
         try:
             if fcntl is not None:
-                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+                fcntl.flock(fd, fcntl.LOCK_UN)
             elif msvcrt is not None:  # pragma: no cover
-                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
         finally:
-            self._fh.close()
-            self._fh = None
+            os.close(fd)
+            self._fd = None
 
     def __enter__(self) -> "_FileLock":
         self.acquire()
@@ -96,10 +269,25 @@ class SkyshelveError(Exception):
 
 
 class SkyShelve:
-    """Minimal dictionary-style wrapper backed by pluggable Go-backed stores."""
+    """Minimal dictionary-style wrapper backed by pluggable Go-backed stores.
+
+    A single instance may be shared between threads. The shared library is
+    loaded with :class:`ctypes.CDLL`, which releases the GIL for the duration
+    of every foreign call, so one thread blocked in ``Sync`` or a slow read
+    does not stall other Python threads. The Go side guards its handle table
+    and the backends are safe for concurrent use; per-thread state on the
+    Python side (the read buffer) is thread-local.
+    """
 
     _init_lock = threading.Lock()
     _lib: Optional[ctypes.CDLL] = None
+    # Hot exports bound once at load time so per-operation calls skip the
+    # CDLL attribute lookup.
+    _SetTagged: Any = None
+    _GetInto: Any = None
+    _Delete: Any = None
+    _Sync: Any = None
+    _FreeBuffer: Any = None
 
     def __init__(
         self,
@@ -123,9 +311,15 @@ class SkyShelve:
         with cls._init_lock:
             if cls._lib is not None:
                 return
-            inferred_path = lib_path or cls._default_library_path()
-            cls._lib = ctypes.CDLL(inferred_path)
+            inferred_path = lib_path or _DEFAULT_LIB_PATH
+            lib = ctypes.CDLL(inferred_path)
+            cls._lib = lib
             cls._configure_signatures()
+            cls._SetTagged = lib.SetTagged
+            cls._GetInto = lib.GetInto
+            cls._Delete = lib.Delete
+            cls._Sync = lib.Sync
+            cls._FreeBuffer = lib.FreeBuffer
 
     @classmethod
     def _configure_signatures(cls) -> None:
@@ -140,19 +334,51 @@ class SkyShelve:
         lib.Set.argtypes = [ctypes.c_size_t, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
         lib.Set.restype = ctypes.c_int
 
+        lib.SetTagged.argtypes = [
+            ctypes.c_size_t,
+            ctypes.c_char_p,
+            ctypes.c_int,
+            ctypes.c_ubyte,
+            ctypes.c_char_p,
+            ctypes.c_int,
+        ]
+        lib.SetTagged.restype = ctypes.c_int
+
         lib.Get.argtypes = [ctypes.c_size_t, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
         lib.Get.restype = ctypes.c_void_p
 
+        lib.GetInto.argtypes = [
+            ctypes.c_size_t,
+            ctypes.c_char_p,
+            ctypes.c_int,
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        lib.GetInto.restype = ctypes.c_int
+
+        lib.GetMany.argtypes = [ctypes.c_size_t, ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+        lib.GetMany.restype = ctypes.c_void_p
+
         lib.Delete.argtypes = [ctypes.c_size_t, ctypes.c_char_p, ctypes.c_int]
         lib.Delete.restype = ctypes.c_int
 
+        lib.Incr.argtypes = [
+            ctypes.c_size_t,
+            ctypes.c_char_p,
+            ctypes.c_int,
+            ctypes.c_longlong,
+            ctypes.POINTER(ctypes.c_longlong),
+        ]
+        lib.Incr.restype = ctypes.c_int
+
         lib.Sync.argtypes = [ctypes.c_size_t]
         lib.Sync.restype = ctypes.c_int
 
         lib.Scan.argtypes = [ctypes.c_size_t, ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
         lib.Scan.restype = ctypes.c_void_p
 
-        lib.Apply.argtypes = [ctypes.c_size_t, ctypes.c_void_p, ctypes.c_int]
+        lib.Apply.argtypes = [ctypes.c_size_t, ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
         lib.Apply.restype = ctypes.c_int
 
         lib.LastError.argtypes = []
@@ -164,15 +390,6 @@ class SkyShelve:
         lib.FreeBuffer.argtypes = [ctypes.c_void_p]
         lib.FreeBuffer.restype = None
 
-    @staticmethod
-    def _default_library_path() -> str:
-        base_dir = os.path.dirname(__file__)
-        suffix = {
-            "win32": ".dll",
-            "darwin": ".dylib",
-        }.get(os.sys.platform, ".so")
-        return os.path.join(base_dir, f"libskyshelve{suffix}")
-
     @classmethod
     def _last_error(cls) -> Optional[str]:
         assert cls._lib is not None
@@ -238,99 +455,182 @@ class SkyShelve:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
-    def _call(self, func_name: str, *args) -> int:
-        if self._handle == 0:
+    def _call(self, func: Callable[..., Any], *args) -> Any:
+        handle = self._handle
+        if handle == 0:
             raise SkyshelveError("skyshelve store is closed")
-        assert self._lib is not None
-        func = getattr(self._lib, func_name)
-        return func(*args)
+        return func(handle, *args)
 
     def _encode_key(self, key: Any) -> bytes:
-        if isinstance(key, (bytes, bytearray, memoryview)):
+        encoder = _KEY_ENCODERS.get(type(key))
+        if encoder is not None:
+            data = encoder(key)
+        elif isinstance(key, (bytes, bytearray, memoryview)):
             data = bytes(key)
         elif isinstance(key, str):
             data = key.encode("utf-8")
         else:
-            data = pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)
+            data = pickle.dumps(key, protocol=_PICKLE_PROTOCOL)
         if not data:
             raise ValueError("empty keys are not supported")
         return data
 
-    def _encode_value(self, value: Any) -> bytes:
+    def _encode_tagged(self, value: Any) -> Tuple[int, bytes]:
+        """Split ``value`` into its type tag and payload.
+
+        ``set`` hands both to ``SetTagged``; ``_apply`` writes the tag byte in
+        front of the payload.
+        """
+
+        encoder = _VALUE_ENCODERS.get(type(value))
+        if encoder is not None:
+            return encoder(value)
         if isinstance(value, (bytes, bytearray, memoryview)):
-            payload = bytes(value)
-            return bytes([_VALUE_RAW]) + payload
+            return _VALUE_RAW, bytes(value)
         if isinstance(value, str):
-            payload = value.encode("utf-8")
-            return bytes([_VALUE_STR]) + payload
+            return _VALUE_STR, value.encode("utf-8")
+        return _VALUE_PICKLED, self._pickle_value(value)
+
+    def _pickle_value(self, value: Any) -> bytes:
         if not self._auto_pickle:
-            raise TypeError(f"Value type {type(value)!r} is not bytes/str and auto_pickle=False.")
-        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
-        return bytes([_VALUE_PICKLED]) + payload
+            raise TypeError(f"Value type {type(value)!r} is not bytes/str/int/float and auto_pickle=False.")
+        return pickle.dumps(value, protocol=_PICKLE_PROTOCOL)
 
-    def _decode_value(self, data: bytes) -> Any:
+    def _decode_value(self, data: Union[bytes, memoryview]) -> Any:
         if not data:
             return b""
         type_tag = data[0]
         payload = data[1:]
         if type_tag == _VALUE_RAW:
-            return payload
+            return bytes(payload)
         if type_tag == _VALUE_STR:
-            return payload.decode("utf-8")
+            return str(payload, "utf-8")
         if type_tag == _VALUE_PICKLED:
-            return pickle.loads(payload)
-        return data
+            # Copy before unpickling: __setstate__ hooks may call get() on this
+            # thread and overwrite the shared read buffer mid-load.
+            return pickle.loads(bytes(payload))
+        if type_tag == _VALUE_INT:
+            return int.from_bytes(payload, "little", signed=True)
+        if type_tag == _VALUE_FLOAT:
+            return _FLOAT_STRUCT.unpack(payload)[0]
+        return bytes(data)
 
     def set(self, key: Any, value: Any) -> None:
         key_bytes = self._encode_key(key)
-        value_bytes = self._encode_value(value)
-        status = self._call(
-            "Set",
-            ctypes.c_size_t(self._handle),
-            ctypes.c_char_p(key_bytes),
-            ctypes.c_int(len(key_bytes)),
-            ctypes.c_char_p(value_bytes),
-            ctypes.c_int(len(value_bytes)),
-        )
-        self._check_status(status)
+        tag, payload = self._encode_tagged(value)
+        handle = self._handle
+        if handle == 0:
+            raise SkyshelveError("skyshelve store is closed")
+        # ctypes converts plain bytes/int per argtypes; no c_* wrappers needed.
+        status = self._SetTagged(handle, key_bytes, len(key_bytes), tag, payload, len(payload))
+        if status != 0:
+            self._check_status(status)
 
     def get(self, key: Any, default: Any = None, *, raise_missing: bool = False) -> Any:
-        key_bytes = self._encode_key(key)
-        value_len = ctypes.c_int()
-        ptr = self._call(
-            "Get",
-            ctypes.c_size_t(self._handle),
-            ctypes.c_char_p(key_bytes),
-            ctypes.c_int(len(key_bytes)),
-            ctypes.byref(value_len),
-        )
-
-        if not ptr and value_len.value == 0:
-            msg = self._last_error()
-            if msg:
-                if "not found" in msg.lower():
-                    if raise_missing:
-                        raise KeyError(key)
-                    return default
-                raise SkyshelveError(msg)
+        view = self._read(self._encode_key(key))
+        if view is None:
             if raise_missing:
                 raise KeyError(key)
             return default
+        return self._decode_value(view)
+
+    def _get_raw(self, key_bytes: bytes) -> Any:
+        """Return the stored (still encoded) value for ``key_bytes`` or ``_MISSING``."""
+
+        view = self._read(key_bytes)
+        if view is None:
+            return _MISSING
+        return bytes(view)
+
+    def _read(self, key_bytes: bytes) -> Optional[memoryview]:
+        """Read a value into this thread's reusable buffer.
+
+        Returns a view that stays valid only until the next read on the same
+        thread, or ``None`` when the key is missing.
+        """
+
+        handle = self._handle
+        if handle == 0:
+            raise SkyshelveError("skyshelve store is closed")
+        buf = _read_buffer
+        length = buf.length
+        view, target, capacity = buf.view, buf.target, buf.capacity
+        while True:
+            status = self._GetInto(handle, key_bytes, len(key_bytes), target, capacity, buf.length_ref)
+            if status == 0:
+                return view[: length.value]
+            if status == 2:
+                return None
+            if status != 1:
+                self._check_status(status)
+            needed = length.value
+            if needed <= _READ_BUFFER_RETAIN:
+                buf.resize(min(max(needed, capacity * 2), _READ_BUFFER_RETAIN))
+                view, target, capacity = buf.view, buf.target, buf.capacity
+            else:
+                # Oversized values get a one-off buffer so idle threads keep at
+                # most _READ_BUFFER_RETAIN bytes.
+                data = bytearray(needed)
+                view, target, capacity = memoryview(data), (ctypes.c_char * needed).from_buffer(data), needed
+
+    def set_many(self, items: Union[Dict[Any, Any], Iterable[Tuple[Any, Any]]]) -> None:
+        """Store several key/value pairs in one backend batch.
+
+        Accepts a mapping or an iterable of ``(key, value)`` pairs. All pairs
+        are committed together, costing a single FFI call instead of one per key.
+        """
+
+        pairs = items.items() if hasattr(items, "items") else items
+        operations: List[Tuple[str, bytes, Optional[Any]]] = [
+            ("set", self._encode_key(key), value) for key, value in pairs
+        ]
+        self._apply(operations)
+
+    def get_many(self, keys: Iterable[Any], default: Any = None) -> List[Any]:
+        """Fetch several keys with a single FFI call.
+
+        Returns the decoded values in the order of ``keys``; missing keys map
+        to ``default``.
+        """
 
+        encoded = [self._encode_key(key) for key in keys]
+        if not encoded:
+            return []
+
+        buffer = bytearray()
+        for key_bytes in encoded:
+            buffer += struct.pack("<I", len(key_bytes))
+            buffer += key_bytes
+
+        assert self._lib is not None
+        arr = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        result_len = ctypes.c_int()
+        ptr = self._call(self._lib.GetMany, arr, len(buffer), ctypes.byref(result_len))
+        if not ptr:
+            raise SkyshelveError(self._last_error() or "unknown skyshelve error")
+
+        results: List[Any] = []
         try:
-            raw = ctypes.string_at(ptr, value_len.value)
+            raw = memoryview((ctypes.c_char * result_len.value).from_address(ptr)).cast("B")
+            offset = 0
+            for _ in encoded:
+                (value_len,) = struct.unpack_from("<I", raw, offset)
+                offset += 4
+                if value_len == _MISSING_VALUE_LEN:
+                    results.append(default)
+                    continue
+                results.append(self._decode_value(raw[offset : offset + value_len]))
+                offset += value_len
+            return results
         finally:
-            self._lib.FreeBuffer(ptr)
-        return self._decode_value(raw)
+            self._FreeBuffer(ptr)
 
     def delete(self, key: Any) -> bool:
         key_bytes = self._encode_key(key)
-        status = self._call(
-            "Delete",
-            ctypes.c_size_t(self._handle),
-            ctypes.c_char_p(key_bytes),
-            ctypes.c_int(len(key_bytes)),
-        )
+        handle = self._handle
+        if handle == 0:
+            raise SkyshelveError("skyshelve store is closed")
+        status = self._Delete(handle, key_bytes, len(key_bytes))
         if status == 0:
             return True
         msg = self._last_error()
@@ -339,8 +639,30 @@ class SkyShelve:
         self._check_status(status)
         return True
 
+    def incr(self, key: Any, delta: int = 1) -> int:
+        """Atomically add ``delta`` to an integer value and return the result.
+
+        Missing keys start from zero. The read-modify-write runs inside the Go
+        library, so no value is decoded or pickled in Python. On SlateDB it is
+        atomic only among handles in this process; concurrent ``incr`` calls
+        from separate processes on one SlateDB store can lose updates. Raises
+        :class:`SkyshelveError` if the stored value is not an int in the 64-bit
+        range. ``delta`` must be an ``int`` in the signed 64-bit range.
+        """
+
+        if not isinstance(delta, int):
+            raise TypeError(f"incr() delta must be an int, not {type(delta).__name__}")
+        if not _INT64_MIN <= delta <= _INT64_MAX:
+            raise OverflowError("incr() delta does not fit in a signed 64-bit integer")
+        key_bytes = self._encode_key(key)
+        assert self._lib is not None
+        result = ctypes.c_longlong()
+        status = self._call(self._lib.Incr, key_bytes, len(key_bytes), delta, ctypes.byref(result))
+        self._check_status(status)
+        return result.value
+
     def sync(self) -> None:
-        status = self._call("Sync", ctypes.c_size_t(self._handle))
+        status = self._call(self._Sync)
         self._check_status(status)
 
     def scan(self, prefix: Any = None) -> List[Tuple[bytes, Any]]:
@@ -350,66 +672,108 @@ class SkyShelve:
             prefix_bytes = self._encode_key(prefix)
 
         result_len = ctypes.c_int()
-        ptr = self._call(
-            "Scan",
-            ctypes.c_size_t(self._handle),
-            ctypes.c_char_p(prefix_bytes),
-            ctypes.c_int(len(prefix_bytes)),
-            ctypes.byref(result_len),
-        )
+        assert self._lib is not None
+        ptr = self._call(self._lib.Scan, prefix_bytes, len(prefix_bytes), ctypes.byref(result_len))
 
         entries: List[Tuple[bytes, Any]] = []
         try:
             length = result_len.value
-            if not ptr or length == 0:
+            if not ptr:
+                if length < 0:
+                    raise SkyshelveError(self._last_error() or "unknown skyshelve error")
                 return entries
 
-            raw = ctypes.string_at(ptr, length)
+            # Parse the packed [klen|vlen|key|value]* result in place instead of
+            # copying the whole buffer out with string_at first.
+            raw = memoryview((ctypes.c_char * length).from_address(ptr)).cast("B")
+            unpack_header = _SCAN_HEADER.unpack_from
+            decode = self._decode_value
+            append = entries.append
             offset = 0
             while offset < length:
-                key_len, value_len = struct.unpack_from("<II", raw, offset)
+                key_len, value_len = unpack_header(raw, offset)
                 offset += 8
-                key = raw[offset : offset + key_len]
+                key = bytes(raw[offset : offset + key_len])
                 offset += key_len
-                value_raw = raw[offset : offset + value_len]
+                append((key, decode(raw[offset : offset + value_len])))
                 offset += value_len
-                entries.append((bytes(key), self._decode_value(value_raw)))
             return entries
         finally:
             if ptr:
-                self._lib.FreeBuffer(ptr)
+                self._FreeBuffer(ptr)
+
+    @contextmanager
+    def transaction(self, *, sync: bool = True):
+        """Buffer writes and commit them as a single batch on exit.
+
+        The yielded batch supports ``batch[key] = value``, ``del batch[key]``,
+        ``set`` and ``delete``. Nothing reaches the store until the block exits
+        without an exception; the writes are then applied atomically with one
+        FFI call, followed by one flush when ``sync`` is true. Reads inside the
+        block see the committed state, not the pending writes.
+        """
+
+        batch = _WriteBatch(self)
+        yield batch
+        self._apply(batch._operations, sync=sync)
+
+    def _apply(self, operations: Sequence[Tuple[str, bytes, Optional[Any]]], *, sync: bool = False) -> bool:
+        """Commit ``operations`` as one backend batch.
+
+        ``"set"`` values are encoded here; ``"set_encoded"`` carries the
+        ``(tag, payload)`` pair ``_encode_tagged`` already produced. Besides
+        those and
+        ``"delete"``, the batch may carry guards:
+        ``("expect", key, raw)`` requires the stored encoded value to equal
+        ``raw`` and ``("expect_missing", key, None)`` requires the key to be
+        absent. Returns ``False`` without writing anything when a guard fails.
+        With ``sync`` the store is flushed after a successful commit.
+        """
 
-    def _apply(self, operations: Sequence[Tuple[str, bytes, Optional[Any]]]) -> None:
         if not operations:
-            return
+            if sync:
+                self.sync()
+            return True
 
         buffer = bytearray()
         for op, key, value in operations:
             if not isinstance(key, (bytes, bytearray, memoryview)):
                 raise TypeError("operation key must be bytes-like")
             key_bytes = bytes(key)
-            if op == "set":
-                encoded = self._encode_value(value)
+            if op == "set" or op == "set_encoded":
+                tag, payload = self._encode_tagged(value) if op == "set" else value
                 buffer.append(0)
                 buffer += struct.pack("<I", len(key_bytes))
                 buffer += key_bytes
-                buffer += struct.pack("<I", len(encoded))
-                buffer += encoded
-            elif op == "delete":
-                buffer.append(1)
+                buffer += struct.pack("<I", len(payload) + 1)
+                buffer.append(tag)
+                buffer += payload
+            elif op == "expect":
+                buffer.append(2)
+                buffer += struct.pack("<I", len(key_bytes))
+                buffer += key_bytes
+                buffer += struct.pack("<I", len(value))
+                buffer += value
+            elif op == "delete" or op == "expect_missing":
+                buffer.append(1 if op == "delete" else 3)
                 buffer += struct.pack("<I", len(key_bytes))
                 buffer += key_bytes
             else:
                 raise ValueError(f"unknown operation '{op}'")
 
-        arr = (ctypes.c_char * len(buffer)).from_buffer_copy(buffer)
-        status = self._call("Apply", ctypes.c_size_t(self._handle), arr, ctypes.c_int(len(buffer)))
+        assert self._lib is not None
+        arr = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        status = self._call(self._lib.Apply, arr, len(buffer), int(sync))
+        if status == 1:
+            return False
         self._check_status(status)
+        return True
 
     def close(self) -> None:
         if self._handle == 0:
             return
-        status = self._call("Close", ctypes.c_size_t(self._handle))
+        assert self._lib is not None
+        status = self._call(self._lib.Close)
         self._handle = 0
         if status != 0:
             self._check_status(status)
@@ -421,6 +785,31 @@ class SkyShelve:
             pass
 
 
+class _WriteBatch:
+    """Pending writes collected by :meth:`SkyShelve.transaction`."""
+
+    def __init__(self, store: SkyShelve) -> None:
+        self._store = store
+        self._operations: List[Tuple[str, bytes, Optional[Any]]] = []
+
+    def set(self, key: Any, value: Any) -> None:
+        # Encode now so later mutation of value cannot change what is stored.
+        store = self._store
+        self._operations.append(("set_encoded", store._encode_key(key), store._encode_tagged(value)))
+
+    def delete(self, key: Any) -> None:
+        self._operations.append(("delete", self._store._encode_key(key), None))
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        self.delete(key)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+
 BadgerDict = SkyShelve
 BadgerError = SkyshelveError
 
@@ -572,24 +961,40 @@ def _extract_slatedb_cache_root(uri: str) -> Optional[str]:
 class PersistentObject:
     """Base class for SkyShelve-backed persistent records with inter-process safety.
 
-    Subclasses should override :meth:`to_record` / :meth:`from_record` when the
-    default dictionary representation is insufficient. Storage is configured per
-    subclass via :meth:`configure_storage` and each operation acquires a file
-    lock so processes coordinate access safely.
+    The class is abstract: it declares empty ``__slots__`` and so cannot hold
+    ``key`` itself; instantiate a subclass. Subclasses should override
+    :meth:`to_record` / :meth:`from_record` when the default dictionary
+    representation is insufficient. Storage is configured per subclass via
+    :meth:`configure_storage`. :meth:`update` and :meth:`delete`
+    commit through compare-and-swap batches and retry on conflict. Single-key
+    reads, writes and deletes hold an advisory lock scoped to that key, as do
+    updates on SlateDB, whose batch guards are not transactional.
+
+    Subclasses may declare ``__slots__`` (which must include ``"key"``, or
+    ``"__dict__"``, else class creation raises :class:`TypeError`) to drop the
+    per-instance ``__dict__``; slot values are persisted alongside any
+    ``__dict__`` attributes.
     """
 
+    # Empty so slotted subclasses can avoid a __dict__ and so the class still
+    # combines with other slotted bases such as pydantic's BaseModel.
+    __slots__ = ()
+
     _storage_path: ClassVar[Optional[Path]] = None
     _storage_in_memory: ClassVar[bool] = False
     _storage_lib_path: ClassVar[Optional[str]] = None
     _storage_auto_pickle: ClassVar[bool] = True
+    _storage_lock_updates: ClassVar[bool] = False
     _lock_path: ClassVar[Optional[Path]] = None
     _namespace: ClassVar[Optional[str]] = None
+    _namespace_bytes: ClassVar[Optional[bytes]] = None
     _secondary_indexes: ClassVar[Dict[str, Callable[["PersistentObject"], Iterable[Any]]]] = {}
     _auto_configured: ClassVar[bool] = False
     _store_tls: ClassVar[Optional[threading.local]] = None
     _store_cache_lock: ClassVar[Optional[threading.Lock]] = None
     _cached_stores: ClassVar[List["SkyShelve"]] = []
     _cleanup_registered: ClassVar[bool] = False
+    _persistent_slots: ClassVar[Tuple[str, ...]] = ()
 
     def __init__(self, key: Any) -> None:
         self._set_persistent_key(key)
@@ -601,6 +1006,9 @@ class PersistentObject:
         super().__init_subclass__(**kwargs)
         if cls is PersistentObject:
             return
+        if not cls.__dictoffset__ and not hasattr(cls, "key"):
+            raise TypeError(f"{cls.__name__} declares __slots__ without 'key' or '__dict__'")
+        cls._persistent_slots = _collect_persistent_slots(cls)
         if getattr(cls, "_auto_configured", False):
             return
 
@@ -687,9 +1095,12 @@ class PersistentObject:
             cls._storage_path = None
 
         cls._storage_in_memory = in_memory
+        # Only SlateDB URIs are kept as str; Badger paths are resolved to Path.
+        cls._storage_lock_updates = isinstance(cls._storage_path, str)
         cls._storage_lib_path = lib_path
         cls._storage_auto_pickle = auto_pickle
         cls._namespace = namespace or cls.__name__
+        cls._namespace_bytes = cls._namespace.encode("utf-8")
 
         if lock_path:
             cls._lock_path = Path(lock_path).expanduser().resolve()
@@ -715,6 +1126,10 @@ class PersistentObject:
         """Persist the current state."""
 
         cls = type(self)
+        if not cls._secondary_indexes:
+            # Nothing to reconcile against the stored record; write it blindly.
+            cls._put_record(self.key, self.to_record())
+            return self
 
         def _writer(_: "PersistentObject") -> "PersistentObject":
             return self
@@ -751,15 +1166,15 @@ class PersistentObject:
             else:
                 values_iter = list(values)
             for value in values_iter:
-                sig = (name, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                sig = (name, pickle.dumps(value, protocol=_PICKLE_PROTOCOL))
                 entries[sig] = value
         return entries
 
     @classmethod
     def _index_prefix_bytes(cls, index_name: str, value: Any) -> bytes:
-        namespace = (cls._namespace or cls.__name__).encode("utf-8")
+        namespace = cls._namespace_bytes or cls.__name__.encode("utf-8")
         index_bytes = index_name.encode("utf-8")
-        value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        value_bytes = pickle.dumps(value, protocol=_PICKLE_PROTOCOL)
         buf = bytearray()
         buf.extend(b"IDX")
         buf.extend(struct.pack("<H", len(namespace)))
@@ -802,38 +1217,113 @@ class PersistentObject:
     def delete(cls, key: Any) -> bool:
         cls._ensure_configured()
         full_key = cls._format_key(key)
-        with cls._locked_store() as store:
-            record = store.get(full_key, default=_MISSING)
-            if record is _MISSING:
-                return False
-            obj = cls.from_record(key, record)
-            primary_bytes = bytes(full_key if isinstance(full_key, (bytes, bytearray, memoryview)) else cls._format_key(key))
-            index_entries = cls._index_entries(obj)
-            operations: List[Tuple[str, bytes, Optional[Any]]] = []
-            for sig, value in index_entries.items():
-                index_name = sig[0]
-                operations.append(("delete", cls._index_key_bytes(index_name, value, primary_bytes), None))
-            operations.append(("delete", primary_bytes, None))
-            store._apply(operations)
-            return True
+        with cls._locked_store(full_key) as store:
+            while True:
+                stored_key, raw = cls._read_stored(store, key, full_key)
+                if raw is _MISSING:
+                    return False
+                obj = cls.from_record(key, store._decode_value(raw))
+                index_entries = cls._index_entries(obj)
+                operations: List[Tuple[str, bytes, Optional[Any]]] = [("expect", stored_key, raw)]
+                for sig, value in index_entries.items():
+                    index_name = sig[0]
+                    operations.append(("delete", cls._index_key_bytes(index_name, value, stored_key), None))
+                operations.append(("delete", stored_key, None))
+                if store._apply(operations):
+                    return True
 
     @classmethod
     def scan(cls, predicate: Optional[Callable[[Any], bool]] = None) -> List["PersistentObject"]:
         cls._ensure_configured()
-        namespace = cls._namespace or cls.__name__
+        namespace_bytes = cls._namespace_bytes or cls.__name__.encode("utf-8")
+        marker_start = len(namespace_bytes)
         results: List[PersistentObject] = []
-        with cls._locked_store() as store:
-            for raw_key, record in store.scan():
+        seen = set()
+        store = cls._get_store()
+        for raw_key, record in store.scan(namespace_bytes + _NSKEY_SEPARATOR):
+            marker = raw_key[marker_start : marker_start + 2]
+            encoded_key = raw_key[marker_start + 2 :]
+            if marker == _NSKEY_STR:
+                obj_key: Any = encoded_key.decode("utf-8")
+            elif marker == _NSKEY_BYTES:
+                obj_key = encoded_key
+            elif marker == _NSKEY_PICKLED:
+                obj_key = pickle.loads(encoded_key)
+            else:
+                continue
+            seen.add(raw_key)
+            if predicate and not predicate(obj_key):
+                continue
+            results.append(cls.from_record(obj_key, record))
+        for obj_key, record in cls._scan_legacy(store):
+            # A record re-saved under the current layout shadows its legacy copy.
+            if cls._format_key(obj_key) in seen:
+                continue
+            if predicate and not predicate(obj_key):
+                continue
+            results.append(cls.from_record(obj_key, record))
+        return results
+
+    @classmethod
+    def _scan_legacy(cls, store: "SkyShelve") -> List[Tuple[Any, Any]]:
+        """``(key, record)`` pairs stored by this class under legacy pickled keys.
+
+        Only keys whose pickle starts with this namespace are unpickled, so
+        keys written by other classes or callers sharing the store never are.
+        """
+
+        namespace = cls._namespace or cls.__name__
+        marker = _legacy_namespace_marker(namespace)
+        entries: List[Tuple[Any, Any]] = []
+        for raw_key, record in store.scan(b"\x80"):
+            if raw_key[2:3] != b"\x95" or not raw_key.startswith(marker, _LEGACY_KEY_HEADER_LEN):
+                continue
+            try:
+                stored_ns, obj_key = pickle.loads(raw_key)
+            except Exception:
+                continue
+            if stored_ns == namespace:
+                entries.append((obj_key, record))
+        return entries
+
+    @classmethod
+    def migrate_legacy_keys(cls) -> int:
+        """Move records stored under legacy pickled keys to the current layout.
+
+        Reads already fall back to legacy keys and :meth:`update` moves the
+        record it touches; this rewrites the rest in one pass and drops legacy
+        copies shadowed by a later :meth:`save`. Returns the number of legacy
+        keys removed.
+        """
+
+        cls._ensure_configured()
+        store = cls._get_store()
+        migrated = 0
+        for obj_key, _ in cls._scan_legacy(store):
+            full_key = cls._format_key(obj_key)
+            legacy_key = cls._legacy_key(obj_key)
+            if store._get_raw(full_key) is _MISSING:
+                # update() with no mutator rewrites the legacy record in place.
                 try:
-                    stored_ns, obj_key = pickle.loads(raw_key)
-                except Exception:
-                    continue
-                if stored_ns != namespace:
+                    cls.update(obj_key)
+                except KeyError:
                     continue
-                if predicate and not predicate(obj_key):
-                    continue
-                results.append(cls.from_record(obj_key, record))
-        return results
+                migrated += 1
+                continue
+            with cls._locked_store(full_key):
+                while True:
+                    raw = store._get_raw(legacy_key)
+                    if raw is _MISSING:
+                        break
+                    shadowed = cls.from_record(obj_key, store._decode_value(raw))
+                    operations: List[Tuple[str, bytes, Optional[Any]]] = [("expect", legacy_key, raw)]
+                    for sig, value in cls._index_entries(shadowed).items():
+                        operations.append(("delete", cls._index_key_bytes(sig[0], value, legacy_key), None))
+                    operations.append(("delete", legacy_key, None))
+                    if store._apply(operations):
+                        migrated += 1
+                        break
+        return migrated
 
     @classmethod
     def scan_index(cls, index_name: str, value: Any) -> List["PersistentObject"]:
@@ -842,13 +1332,12 @@ class PersistentObject:
             raise KeyError(f"index '{index_name}' is not registered")
         prefix = cls._index_prefix_bytes(index_name, value)
         results: List[PersistentObject] = []
-        with cls._locked_store() as store:
-            for _, stored_key in store.scan(prefix):
-                full_key = cls._format_key(stored_key)
-                record = store.get(full_key, default=_MISSING)
-                if record is _MISSING:
-                    continue
-                results.append(cls.from_record(stored_key, record))
+        store = cls._get_store()
+        for _, stored_key in store.scan(prefix):
+            record = cls._lookup(store, stored_key, cls._format_key(stored_key))
+            if record is _MISSING:
+                continue
+            results.append(cls.from_record(stored_key, record))
         return results
 
     @classmethod
@@ -870,52 +1359,68 @@ class PersistentObject:
         ``mutator`` receives the current object (creating one via
         ``default_factory`` when missing). Returning ``None`` implies in-place
         mutation and the same object is re-written.
+
+        Concurrency is optimistic: the write is committed only if the stored
+        record is unchanged since it was read, otherwise the record is
+        re-read and ``mutator`` runs again. A record found under its legacy
+        pickled key is moved to the current key in the same batch.
         """
 
         cls._ensure_configured()
         full_key = cls._format_key(key)
+        store = cls._get_store()
 
-        with cls._locked_store() as store:
-            record = store.get(full_key, default=_MISSING)
-            if record is _MISSING:
-                if default_factory is None:
-                    raise KeyError(key)
-                candidate = default_factory() if callable(default_factory) else default_factory
-                if not isinstance(candidate, cls):
-                    raise TypeError("default_factory must produce an instance of the subclass")
-                candidate._set_persistent_key(key)
-                current = candidate
-                previous_entries: Dict[Tuple[str, bytes], Any] = {}
-            else:
-                current = cls.from_record(key, record)
-                previous_entries = cls._index_entries(current)
-
-            if mutator is not None:
-                updated = mutator(current)
-                if updated is not None:
-                    current = updated
-
-            if not isinstance(current, cls):
-                raise TypeError("mutator must return an instance of the subclass or None")
-
-            new_entries = cls._index_entries(current)
-
-            primary_bytes = bytes(full_key if isinstance(full_key, (bytes, bytearray, memoryview)) else cls._format_key(key))
-
-            operations: List[Tuple[str, bytes, Optional[Any]]] = []
-
-            for sig, value in previous_entries.items():
-                if sig not in new_entries:
-                    operations.append(("delete", cls._index_key_bytes(sig[0], value, primary_bytes), None))
-
-            operations.append(("set", primary_bytes, current.to_record()))
-
-            for sig, value in new_entries.items():
-                if sig not in previous_entries:
-                    operations.append(("set", cls._index_key_bytes(sig[0], value, primary_bytes), key))
-
-            store._apply(operations)
-            return current
+        # SlateDB evaluates the batch guards outside any transaction, so two
+        # handles (threads or processes) could both pass them; the per-key
+        # file lock serialises those writers. Badger detects the conflict.
+        lock_cm = cls._lock_context(full_key) if cls._storage_lock_updates else nullcontext()
+        with lock_cm:
+            while True:
+                stored_key, raw = cls._read_stored(store, key, full_key)
+                operations: List[Tuple[str, bytes, Optional[Any]]] = []
+                if raw is _MISSING:
+                    if default_factory is None:
+                        raise KeyError(key)
+                    candidate = default_factory() if callable(default_factory) else default_factory
+                    if not isinstance(candidate, cls):
+                        raise TypeError("default_factory must produce an instance of the subclass")
+                    candidate._set_persistent_key(key)
+                    current = candidate
+                    previous_entries: Dict[Tuple[str, bytes], Any] = {}
+                    operations.append(("expect_missing", full_key, None))
+                else:
+                    current = cls.from_record(key, store._decode_value(raw))
+                    previous_entries = cls._index_entries(current)
+                    operations.append(("expect", stored_key, raw))
+                migrating = stored_key != full_key
+                if migrating:
+                    operations.append(("expect_missing", full_key, None))
+                    operations.append(("delete", stored_key, None))
+
+                if mutator is not None:
+                    updated = mutator(current)
+                    if updated is not None:
+                        current = updated
+
+                if not isinstance(current, cls):
+                    raise TypeError("mutator must return an instance of the subclass or None")
+
+                new_entries = cls._index_entries(current)
+
+                # Index keys embed the primary storage key, so a migrated record
+                # has every entry rewritten.
+                for sig, value in previous_entries.items():
+                    if migrating or sig not in new_entries:
+                        operations.append(("delete", cls._index_key_bytes(sig[0], value, stored_key), None))
+
+                operations.append(("set", full_key, current.to_record()))
+
+                for sig, value in new_entries.items():
+                    if migrating or sig not in previous_entries:
+                        operations.append(("set", cls._index_key_bytes(sig[0], value, full_key), key))
+
+                if store._apply(operations):
+                    return current
 
     # ------------------------------------------------------------------
     # Extensibility hooks
@@ -923,9 +1428,13 @@ class PersistentObject:
     def to_record(self) -> Any:
         """Convert the instance to a storable representation."""
 
-        payload = dict(self.__dict__)
-        payload.pop("key", None)
-        return {k: _serialize_field(v) for k, v in payload.items()}
+        state = getattr(self, "__dict__", None)
+        record = {} if state is None else {k: _serialize_field(v) for k, v in state.items() if k != "key"}
+        for name in self._persistent_slots:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                record[name] = _serialize_field(value)
+        return record
 
     @classmethod
     def from_record(cls, key: Any, record: Any) -> "PersistentObject":
@@ -935,9 +1444,19 @@ class PersistentObject:
         except TypeError:
             pass
         if isinstance(record, dict):
-            instance.__dict__.update({k: _deserialize_field(v) for k, v in record.items()})
+            fields = {k: _deserialize_field(v) for k, v in record.items()}
+            if cls._persistent_slots:
+                for name, value in fields.items():
+                    setattr(instance, name, value)
+            else:
+                instance.__dict__.update(fields)
         else:
-            instance.value = record
+            try:
+                instance.value = record
+            except AttributeError:
+                raise TypeError(
+                    f"{cls.__name__} cannot hold a non-dict record; declare a 'value' slot or override from_record"
+                ) from None
         object.__setattr__(instance, "key", key)
         return instance
 
@@ -951,14 +1470,27 @@ class PersistentObject:
 
     @classmethod
     def _format_key(cls, key: Any) -> bytes:
-        namespace = cls._namespace or cls.__name__
-        return pickle.dumps((namespace, key), protocol=pickle.HIGHEST_PROTOCOL)
+        key_type = type(key)
+        if key_type is str:
+            namespace_bytes = cls._namespace_bytes or cls.__name__.encode("utf-8")
+            return namespace_bytes + _NSKEY_STR + key.encode("utf-8")
+        if key_type is bytes:
+            namespace_bytes = cls._namespace_bytes or cls.__name__.encode("utf-8")
+            return namespace_bytes + _NSKEY_BYTES + key
+        namespace_bytes = cls._namespace_bytes or cls.__name__.encode("utf-8")
+        if key_type is int:
+            return _pickled_nskey(namespace_bytes, key, (int,))
+        if key_type is tuple:
+            signature = tuple(map(type, key))
+            if _MEMO_KEY_PART_TYPES.issuperset(signature):
+                return _pickled_nskey(namespace_bytes, key, signature)
+        return namespace_bytes + _NSKEY_PICKLED + pickle.dumps(key, protocol=_PICKLE_PROTOCOL)
 
     @classmethod
     @contextmanager
-    def _locked_store(cls):
+    def _locked_store(cls, key_bytes: Optional[bytes] = None):
         cls._ensure_configured()
-        lock_cm = cls._lock_context()
+        lock_cm = cls._lock_context(key_bytes)
         with lock_cm:
             store = cls._get_store()
             yield store
@@ -1066,16 +1598,18 @@ class PersistentObject:
     @classmethod
     def _reset_store_cache(cls) -> None:
         cls._close_cached_stores()
+        if cls._lock_path is not None:
+            _FileLock.discard(cls._lock_path)
         cls._store_tls = threading.local()
         cls._store_cache_lock = threading.Lock()
         cls._cached_stores = []
         cls._cleanup_registered = False
 
     @classmethod
-    def _lock_context(cls):
+    def _lock_context(cls, key_bytes: Optional[bytes] = None):
         if cls._lock_path is None:
             return nullcontext()
-        return _FileLock(cls._lock_path)
+        return _FileLock(cls._lock_path, key_bytes)
 
     @classmethod
     def _open_store(cls):
@@ -1092,14 +1626,98 @@ class PersistentObject:
             auto_pickle=cls._storage_auto_pickle,
         )
 
+    @classmethod
+    def _put_record(cls, key: Any, record: Any) -> None:
+        cls._ensure_configured()
+        full_key = cls._format_key(key)
+        with cls._locked_store(full_key) as store:
+            # A legacy copy is left alone: reads and scan() prefer this key and
+            # migrate_legacy_keys() removes the shadowed copy.
+            store.set(full_key, record)
+
     @classmethod
     def _get_record(cls, key: Any) -> Any:
         cls._ensure_configured()
         full_key = cls._format_key(key)
-        with cls._locked_store() as store:
-            result = store.get(full_key, default=_MISSING)
+        with cls._locked_store(full_key) as store:
+            return cls._lookup(store, key, full_key)
+
+    @classmethod
+    def _legacy_key(cls, key: Any) -> bytes:
+        """Storage key used before keys were laid out under a namespace prefix."""
+
+        return pickle.dumps((cls._namespace or cls.__name__, key), protocol=_PICKLE_PROTOCOL)
+
+    @classmethod
+    def _lookup(cls, store: "SkyShelve", key: Any, full_key: bytes) -> Any:
+        """Decoded record for ``key`` (checking its legacy key too) or ``_MISSING``."""
+
+        result = store.get(full_key, default=_MISSING)
+        if result is _MISSING:
+            result = store.get(cls._legacy_key(key), default=_MISSING)
         return result
 
+    @classmethod
+    def _read_stored(cls, store: "SkyShelve", key: Any, full_key: bytes) -> Tuple[bytes, Any]:
+        """Return ``(storage_key, raw)`` for ``key``, falling back to its legacy key.
+
+        ``raw`` is the still-encoded value, or ``_MISSING`` (with ``full_key``)
+        when neither key exists.
+        """
+
+        raw = store._get_raw(full_key)
+        if raw is _MISSING:
+            legacy_key = cls._legacy_key(key)
+            legacy_raw = store._get_raw(legacy_key)
+            if legacy_raw is not _MISSING:
+                return legacy_key, legacy_raw
+        return full_key, raw
+
+
+def _collect_persistent_slots(cls: type) -> Tuple[str, ...]:
+    """Slot attribute names declared by ``cls`` and its PersistentObject bases."""
+
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        if not issubclass(klass, PersistentObject):
+            continue
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("key", "__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            if name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+# Key types whose equality implies identical pickles, making them safe to memoize.
+_MEMO_KEY_PART_TYPES = frozenset((str, bytes, int))
+
+
+@functools.lru_cache(maxsize=4096)
+def _pickled_nskey(namespace_bytes: bytes, key: Any, signature: Tuple[type, ...]) -> bytes:
+    """Memoized pickled storage key for repeated int and flat tuple keys.
+
+    ``signature`` holds the exact element types so that equal keys with
+    different pickles (``(1,)`` vs ``(True,)``) get separate cache entries.
+    """
+
+    return namespace_bytes + _NSKEY_PICKLED + pickle.dumps(key, protocol=_PICKLE_PROTOCOL)
+
+
+@functools.lru_cache(maxsize=None)
+def _legacy_namespace_marker(namespace: str) -> bytes:
+    """Opcodes that follow the frame header of a legacy ``(namespace, key)`` key."""
+
+    encoded = namespace.encode("utf-8")
+    dumped = pickle.dumps((namespace, None), protocol=_PICKLE_PROTOCOL)
+    end = dumped.index(encoded, _LEGACY_KEY_HEADER_LEN) + len(encoded)
+    return dumped[_LEGACY_KEY_HEADER_LEN:end]
+
 
 def _is_pydantic_model(value: Any) -> bool:
     if _PydanticBaseModel is None:
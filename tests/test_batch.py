@@ -0,0 +1,58 @@
+import pytest
+
+
+def test_set_many_get_many_roundtrip(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        store.set_many({"a": b"1", "b": "two", ("c", 3): {"three": 3}})
+        store.set_many([("d", b"")])
+
+        assert store.get_many(["a", "b", ("c", 3), "d"]) == [b"1", "two", {"three": 3}, b""]
+        assert store.get_many(["a", "missing"], default=0) == [b"1", 0]
+        assert store.get_many([]) == []
+
+
+def test_transaction_commits_on_exit(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        store["stale"] = b"x"
+        with store.transaction() as batch:
+            batch["logins_alice"] = 1
+            batch.set("logins_bob", 2)
+            del batch["stale"]
+            assert "logins_alice" not in store
+
+        assert store.get_many(["logins_alice", "logins_bob", "stale"]) == [1, 2, None]
+
+
+def test_transaction_discards_on_error(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        try:
+            with store.transaction() as batch:
+                batch["pending"] = b"value"
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        assert "pending" not in store
+
+
+def test_transaction_encodes_values_on_set(shared_library):
+    from skyshelve import SkyShelve
+
+    store = SkyShelve(None, in_memory=True, lib_path=str(shared_library), auto_pickle=False)
+    try:
+        with store.transaction() as batch:
+            with pytest.raises(TypeError):
+                batch["obj"] = {"a": 1}
+        assert "obj" not in store
+    finally:
+        store.close()
+
+
+def test_transaction_snapshots_values(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        value = {"count": 1}
+        with store.transaction() as batch:
+            batch["doc"] = value
+            value["count"] = 2
+
+        assert store["doc"] == {"count": 1}
@@ -1,9 +1,11 @@
 import multiprocessing
+import os
+import pickle
 from pathlib import Path
 
 import pytest
 
-from skyshelve import PersistentObject
+from skyshelve import _MISSING, PersistentObject
 
 
 class Note(PersistentObject):
@@ -40,12 +42,28 @@ class Counter(PersistentObject):
         return cls.update(key, default_factory=lambda: cls(key, 0), mutator=mutator)
 
 
+class SlottedCounter(PersistentObject):
+    __slots__ = ("key", "value")
+
+    def __init__(self, key: str, value: int = 0) -> None:
+        super().__init__(key)
+        self.value = value
+
+
 def _counter_worker(db_path: str, lib_path: str, iterations: int) -> None:
     Counter.configure_storage(db_path, lib_path=lib_path, secondary_indexes={"value": counter_value_index})
     for _ in range(iterations):
         Counter.increment("global")
 
 
+def _hold_key_lock(lock_path: str, key: bytes, acquired, release) -> None:
+    from skyshelve import _FileLock
+
+    with _FileLock(Path(lock_path), key):
+        acquired.set()
+        release.wait(10)
+
+
 def test_persistent_object_roundtrip(tmp_path, shared_library):
     db_path = tmp_path / "notes"
     Note.configure_storage(str(db_path), lib_path=str(shared_library), secondary_indexes={"tag": note_tags})
@@ -101,3 +119,244 @@ def test_persistent_object_multi_process(tmp_path, shared_library):
     assert value_matches[0].value == result.value
     child_matches = Counter.children("value", result.value)
     assert child_matches and child_matches[0].value == result.value
+
+
+def test_keyed_file_lock_across_processes(tmp_path):
+    pytest.importorskip("fcntl")
+    ctx = multiprocessing.get_context("spawn")
+    lock_path = str(tmp_path / "keys.lock")
+    release = ctx.Event()
+
+    def start(key: bytes):
+        acquired = ctx.Event()
+        proc = ctx.Process(target=_hold_key_lock, args=(lock_path, key, acquired, release))
+        proc.start()
+        return proc, acquired
+
+    holder, holder_acquired = start(b"alpha")
+    assert holder_acquired.wait(10)
+    other, other_acquired = start(b"beta")
+    same, same_acquired = start(b"alpha")
+    try:
+        # A different key is granted while "alpha" is held; the same key waits.
+        assert other_acquired.wait(10)
+        assert not same_acquired.wait(0.5)
+        release.set()
+        assert same_acquired.wait(10)
+    finally:
+        release.set()
+        for proc in (holder, other, same):
+            proc.join(10)
+    assert [proc.exitcode for proc in (holder, other, same)] == [0, 0, 0]
+
+
+def test_reconfigure_closes_keyed_lock_descriptor(tmp_path):
+    pytest.importorskip("fcntl")
+    from skyshelve import _FileLock
+
+    Note.configure_storage(str(tmp_path / "first"))
+    first_lock = Note._lock_path
+    with Note._lock_context(b"k"):
+        pass
+    fd = _FileLock._range_fds[first_lock]
+
+    Note.configure_storage(str(tmp_path / "second"))
+
+    assert first_lock not in _FileLock._range_fds
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def test_persistent_object_key_encoding(tmp_path, shared_library):
+    Note.configure_storage(str(tmp_path / "keyed"), lib_path=str(shared_library))
+
+    assert Note._format_key("n1") == b"Note\x1fsn1"
+    assert Note._format_key(b"n1") == b"Note\x1fbn1"
+    assert Note._format_key(("n", 1)) == b"Note\x1fp" + pickle.dumps(("n", 1), protocol=5)
+
+    Note("n1", "text key").save()
+    Note(b"n1", "bytes key").save()
+    Note(("n", 1), "tuple key").save()
+
+    assert Note.load("n1").text == "text key"
+    assert Note.load(b"n1").text == "bytes key"
+    assert Note.load(("n", 1)).text == "tuple key"
+    assert {note.key: note.text for note in Note.scan()} == {
+        "n1": "text key",
+        b"n1": "bytes key",
+        ("n", 1): "tuple key",
+    }
+
+
+class Vehicle(Note):
+    pass
+
+
+def test_persistent_object_scan_never_unpickles_foreign_keys(tmp_path, shared_library, capsys):
+    Note.configure_storage(str(tmp_path / "shared"), lib_path=str(shared_library))
+    Vehicle.configure_storage(str(tmp_path / "shared"), lib_path=str(shared_library))
+    store = Note._get_store()
+    payload = "x\ncbuiltins\nprint\n(S'pwned'\ntR."
+
+    with Vehicle.using_store(store):
+        Vehicle(payload, "crafted").save()
+        Vehicle("u" * 104 + payload, "padded").save()
+        assert sorted(vehicle.text for vehicle in Vehicle.scan()) == ["crafted", "padded"]
+    Note("n1", "note").save()
+    store["plain"] = "unrelated"
+
+    assert [note.text for note in Note.scan()] == ["note"]
+    assert "pwned" not in capsys.readouterr().out
+
+
+def test_persistent_object_memoized_keys_respect_type(tmp_path, shared_library):
+    Note.configure_storage(str(tmp_path / "memo"), lib_path=str(shared_library))
+
+    # Equal keys with different pickles must not share a memoized entry.
+    assert Note._format_key(1) != Note._format_key(True)
+    assert Note._format_key(True) != Note._format_key(1)
+    assert Note._format_key((1,)) != Note._format_key((True,))
+    assert Note._format_key((True,)) != Note._format_key((1,))
+
+    Note(7, "int key").save()
+    assert Note.load(7).text == "int key"
+    assert Note.load(7).text == "int key"
+    assert Note.exists(7)
+    assert not Note.exists(True)
+
+
+def test_persistent_object_reads_and_migrates_legacy_keys(tmp_path, shared_library):
+    Note.configure_storage(str(tmp_path / "legacy"), lib_path=str(shared_library), secondary_indexes={"tag": note_tags})
+    store = Note._get_store()
+    legacy_key = pickle.dumps(("Note", "n1"), protocol=5)
+    legacy_index_key = Note._index_key_bytes("tag", "old", legacy_key)
+    store.set(legacy_key, {"text": "legacy", "tags": ["old"]})
+    store.set(legacy_index_key, "n1")
+
+    assert Note.exists("n1")
+    assert Note.load("n1").text == "legacy"
+    assert [note.text for note in Note.scan_index("tag", "old")] == ["legacy"]
+
+    def mutator(note: Note) -> None:
+        note.text = "migrated"
+
+    Note.update("n1", default_factory=lambda: Note("n1"), mutator=mutator)
+
+    assert legacy_key not in store
+    assert legacy_index_key not in store
+    assert [(note.key, note.text) for note in Note.scan()] == [("n1", "migrated")]
+    assert [note.text for note in Note.scan_index("tag", "old")] == ["migrated"]
+    assert Note.delete("n1")
+    assert Note.scan() == []
+
+
+def test_persistent_object_migrate_legacy_keys(tmp_path, shared_library):
+    Note.configure_storage(str(tmp_path / "migrate"), lib_path=str(shared_library))
+    store = Note._get_store()
+    shadowed_key = pickle.dumps(("Note", "n1"), protocol=5)
+    pending_key = pickle.dumps(("Note", 2), protocol=5)
+    store.set(shadowed_key, {"text": "stale", "tags": []})
+    store.set(pending_key, {"text": "legacy", "tags": []})
+
+    # save() writes only the current key; the legacy copy is shadowed.
+    Note("n1", "fresh").save()
+    assert Note.load("n1").text == "fresh"
+    assert sorted(note.text for note in Note.scan()) == ["fresh", "legacy"]
+
+    assert Note.migrate_legacy_keys() == 2
+    assert shadowed_key not in store
+    assert pending_key not in store
+    assert {note.key: note.text for note in Note.scan()} == {"n1": "fresh", 2: "legacy"}
+    assert Note.migrate_legacy_keys() == 0
+
+
+def test_persistent_object_reuses_open_store(tmp_path, shared_library):
+    Note.configure_storage(str(tmp_path / "cached"), lib_path=str(shared_library))
+
+    Note("n1", "first").save()
+    store = Note._get_store()
+    Note.load("n1")
+    Note("n2", "second").save()
+
+    assert Note._get_store() is store
+    assert store._handle != 0
+
+
+def test_persistent_object_update_retries_on_conflict(tmp_path, shared_library):
+    Counter.configure_storage(str(tmp_path / "cas"), lib_path=str(shared_library))
+    Counter("c", 1).save()
+    attempts = []
+
+    def mutator(obj: Counter) -> None:
+        attempts.append(obj.value)
+        if len(attempts) == 1:
+            # A competing writer lands between our read and our commit.
+            Counter.update("c", mutator=lambda other: setattr(other, "value", 10))
+        obj.value += 1
+
+    result = Counter.update("c", mutator=mutator)
+
+    assert attempts == [1, 10]
+    assert result.value == 11
+    assert Counter.load("c").value == 11
+
+
+def test_persistent_object_update_locks_key_on_slatedb(tmp_path, shared_library, monkeypatch):
+    Counter.configure_storage(str(tmp_path / "badger-cas"), lib_path=str(shared_library))
+    assert not Counter._storage_lock_updates
+    Counter.configure_storage(f"slatedb:{tmp_path / 'slate-cas'}", lib_path=str(shared_library))
+    assert Counter._storage_lock_updates
+
+    locked = []
+    original = Counter._lock_context.__func__
+
+    def recording_lock(cls, key_bytes=None):
+        locked.append(key_bytes)
+        return original(cls, key_bytes)
+
+    monkeypatch.setattr(Counter, "_lock_context", classmethod(recording_lock))
+    monkeypatch.setattr(Counter, "_get_store", classmethod(lambda cls: _FakeStore()))
+    Counter.update("c", default_factory=lambda: Counter("c"), mutator=lambda obj: None)
+
+    assert locked == [Counter._format_key("c")]
+
+
+class _FakeStore:
+    """Store stand-in that reports every key missing and accepts every batch."""
+
+    def _get_raw(self, key_bytes):
+        return _MISSING
+
+    def _apply(self, operations, *, sync=False):
+        return True
+
+
+def test_persistent_object_slots(tmp_path, shared_library):
+    SlottedCounter.configure_storage(str(tmp_path / "slots"), lib_path=str(shared_library))
+
+    counter = SlottedCounter("s", 3)
+    assert not hasattr(counter, "__dict__")
+    assert counter.to_record() == {"value": 3}
+    counter.save()
+
+    loaded = SlottedCounter.load("s")
+    assert loaded.key == "s"
+    assert loaded.value == 3
+
+
+def test_persistent_object_slots_require_key():
+    with pytest.raises(TypeError, match="key"):
+
+        class MissingKey(PersistentObject):
+            __slots__ = ("value",)
+
+    class WithDict(PersistentObject):
+        __slots__ = ("value", "__dict__")
+
+    assert WithDict("w").key == "w"
+
+    class SlottedName(PersistentObject):
+        __slots__ = ("key", "name")
+
+    with pytest.raises(TypeError, match="value"):
+        SlottedName.from_record("s", 5)
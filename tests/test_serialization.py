@@ -38,3 +38,57 @@ def test_auto_pickle_disabled(shared_library, tmp_path):
     with pytest.raises(TypeError):
         store["obj"] = {"a": 1}
     store.close()
+
+
+def test_incr_counts_natively(skyshelve_factory):
+    from skyshelve import SkyshelveError
+
+    with skyshelve_factory(in_memory=True) as store:
+        assert store.incr("hits") == 1
+        assert store.incr("hits", 41) == 42
+        assert store.incr("hits", -50) == -8
+        assert store["hits"] == -8
+
+        store["text"] = "not a number"
+        with pytest.raises(SkyshelveError):
+            store.incr("text")
+
+
+def test_incr_rejects_out_of_range_delta(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        with pytest.raises(OverflowError):
+            store.incr("hits", 2**64 + 5)
+        with pytest.raises(OverflowError):
+            store.incr("hits", -(2**63) - 1)
+        with pytest.raises(TypeError):
+            store.incr("hits", 1.5)
+        assert "hits" not in store
+        assert store.incr("hits", 2**63 - 1) == 2**63 - 1
+
+
+def test_get_grows_read_buffer(skyshelve_factory):
+    small = b"s" * 10
+    medium = b"m" * 10_000
+    large = b"l" * 300_000
+    with skyshelve_factory(in_memory=True) as store:
+        store["small"] = small
+        store["medium"] = medium
+        store["large"] = large
+
+        assert store["large"] == large
+        assert store["medium"] == medium
+        assert store["small"] == small
+        assert store["large"] == large
+
+
+def test_numbers_use_native_encoding(skyshelve_factory):
+    with skyshelve_factory(in_memory=True) as store:
+        values = {"zero": 0, "neg": -129, "big": 2**80, "pi": 3.25, "flag": True}
+        store.set_many(values)
+        for key, expected in values.items():
+            stored = store[key]
+            assert stored == expected
+            assert type(stored) is type(expected)
+
+        store["count"] = 5
+        assert store.incr("count") == 6